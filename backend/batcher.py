@@ -0,0 +1,119 @@
+"""
+batcher.py — EduPilot AI · Dynamic Request Batching
+
+Coalesces feature rows from concurrent /analyze requests into a single
+matrix so the model runs once per batch instead of once per request.
+"""
+
+import asyncio
+from collections.abc import Callable
+
+import anyio
+import numpy as np
+
+
+class DynBatcher:
+    """
+    Queue-backed dynamic batcher.
+
+    A background worker waits for the first pending row, then keeps
+    collecting rows until either `max_batch_size` rows are queued or
+    `max_delay` seconds have passed. The batch is written into a
+    preallocated `(max_batch_size, n_features)` buffer, passed to
+    `predict_fn` once, and each caller's future is resolved with its own
+    prediction. `predict_fn` runs in a worker thread so the event loop
+    keeps serving requests meanwhile; that thread comes from the
+    batcher's own capacity limiter, so other threadpool work (e.g. plan
+    generation) can never hold up inference.
+    """
+
+    def __init__(self, n_features: int, max_batch_size: int = 64, max_delay: float = 0.010):
+        self.max_batch_size = max_batch_size
+        self.max_delay      = max_delay
+        # Reused for every batch — safe because only one batch is in flight at a time
+        self._buffer = np.empty((max_batch_size, n_features), dtype=np.float64)
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._batch: list = []                      # rows taken off the queue, not yet resolved
+        self._limiter: anyio.CapacityLimiter | None = None
+
+    @property
+    def _running_queue(self) -> asyncio.Queue:
+        """The live request queue; raises if the batcher has not been started."""
+        if self._queue is None:
+            raise RuntimeError(
+                "Inference batcher is not running — start() must be called first "
+                "(normally by the app lifespan; enable lifespan events or use TestClient as a context manager)."
+            )
+        return self._queue
+
+    async def start(self, predict_fn: Callable[[np.ndarray], np.ndarray]) -> None:
+        """Create the queue and launch the background worker around `predict_fn`."""
+        self._queue   = asyncio.Queue()
+        self._limiter = anyio.CapacityLimiter(1)    # one batch in flight at a time
+        self._worker  = asyncio.create_task(self._run(predict_fn))
+
+    async def stop(self) -> None:
+        """Cancel the background worker and fail any requests still waiting on it."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        queue   = self._running_queue
+        pending = self._batch
+        while not queue.empty():
+            pending.append(queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Inference batcher stopped before prediction"))
+        self._batch = []
+        self._queue = None
+
+    async def predict(self, row):
+        """Queue a single feature row (sequence of floats) and wait for its prediction."""
+        queue  = self._running_queue
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((row, future))
+        return await future
+
+    async def _collect(self) -> list:
+        """Block for the first row, then gather more until size or delay limit."""
+        loop  = asyncio.get_running_loop()
+        queue = self._running_queue
+        batch = self._batch = [await queue.get()]
+        deadline = loop.time() + self.max_delay
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self, predict_fn: Callable[[np.ndarray], np.ndarray]) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                rows = self._buffer[:len(batch)]
+                for i, (row, _) in enumerate(batch):
+                    rows[i] = row
+                predictions = await anyio.to_thread.run_sync(predict_fn, rows, limiter=self._limiter)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self._batch = []
+                continue
+
+            for (_, future), prediction in zip(batch, predictions):
+                if not future.done():               # caller may have disconnected
+                    future.set_result(prediction)
+            self._batch = []
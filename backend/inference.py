@@ -0,0 +1,118 @@
+"""
+inference.py — EduPilot AI · Fast Forest Inference
+
+Two interchangeable mastery-level predictors, both exposing
+`predict(X) -> labels` for a 2-D feature matrix:
+  • OnnxForest — the forest exported to ONNX, run by ONNX Runtime's
+    fused C++ tree-ensemble kernel (used when available).
+  • FastForest — the pickled RandomForestClassifier compiled into flat
+    NumPy arrays and evaluated without sklearn's per-call overhead.
+"""
+
+import os
+
+import numpy as np
+
+try:
+    import onnxruntime as ort
+except ImportError:                             # optional — FastForest is used instead
+    ort = None
+
+
+class FastForest:
+    """
+    Array-specialised RandomForestClassifier.
+
+    At load time each tree's node arrays are stacked into padded
+    `(n_trees, max_nodes)` matrices and flattened. Leaves point to
+    themselves, so a fixed number of branchless `np.where` steps (one
+    per level of the deepest tree) walks all trees for all rows at once.
+    Leaf values are pre-normalised into class probabilities and summed
+    in estimator order, exactly like RandomForestClassifier.predict.
+    """
+
+    def __init__(self, model):
+        trees     = [est.tree_ for est in model.estimators_]
+        n_trees   = len(trees)
+        max_nodes = max(t.node_count for t in trees)
+
+        self.classes   = model.classes_
+        self.n_classes = len(model.classes_)
+        self.depth     = max(t.max_depth for t in trees)
+
+        feature   = np.zeros((n_trees, max_nodes), dtype=np.intp)
+        threshold = np.zeros((n_trees, max_nodes), dtype=np.float64)
+        left      = np.zeros((n_trees, max_nodes), dtype=np.intp)
+        right     = np.zeros((n_trees, max_nodes), dtype=np.intp)
+        value     = np.zeros((n_trees, max_nodes, self.n_classes), dtype=np.float64)
+
+        for i, t in enumerate(trees):
+            n       = t.node_count
+            is_leaf = t.children_left == -1
+            nodes   = np.arange(n)
+
+            feature[i, :n]   = np.where(is_leaf, 0, t.feature)
+            threshold[i, :n] = t.threshold
+            left[i, :n]      = np.where(is_leaf, nodes, t.children_left)
+            right[i, :n]     = np.where(is_leaf, nodes, t.children_right)
+
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            proba      = t.value[:, 0, :self.n_classes]
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            value[i, :n] = proba / normalizer
+
+        # Flatten with per-tree offsets so child links become global node
+        # indices and traversal can use np.take instead of 2-D fancy indexing
+        offset = np.arange(n_trees)[:, np.newaxis] * max_nodes
+
+        self.roots     = offset.ravel()
+        self.feature   = feature.ravel()
+        self.threshold = threshold.ravel()
+        self.left      = (left + offset).ravel()
+        self.right     = (right + offset).ravel()
+        self.value     = value.reshape(-1, self.n_classes)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predict class labels for a 2-D feature matrix."""
+        # sklearn evaluates splits on float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+
+        # One column per tree, every row starting at that tree's root
+        node = np.tile(self.roots, (X.shape[0], 1))
+        for _ in range(self.depth):
+            x    = np.take_along_axis(X, self.feature.take(node), axis=1)
+            node = np.where(x <= self.threshold.take(node), self.left.take(node), self.right.take(node))
+
+        # cumsum adds trees left-to-right, matching the forest's sequential +=
+        votes = np.cumsum(self.value[node], axis=1)[:, -1] / len(self.roots)
+        return self.classes.take(votes.argmax(axis=1))
+
+
+class OnnxForest:
+    """
+    RandomForestClassifier exported by skl2onnx (see train.py) and
+    executed with ONNX Runtime on the CPU provider.
+
+    `num_threads` bounds ORT's intra-op pool. It defaults to 1 because
+    parallelism comes from running one server worker per core; ORT's
+    default (one thread per core in every worker) oversubscribes the CPU.
+    """
+
+    def __init__(self, path: str, num_threads: int = 1):
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+        self.session    = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.label_name = self.session.get_outputs()[0].name
+
+    @staticmethod
+    def available(path: str) -> bool:
+        """True if onnxruntime is installed and the exported model exists."""
+        return ort is not None and os.path.exists(path)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predict class labels for a 2-D feature matrix."""
+        X = np.asarray(X, dtype=np.float32)
+        return self.session.run([self.label_name], {self.input_name: X})[0]
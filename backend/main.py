@@ -1,38 +1,89 @@
 """
 main.py — EduPilot AI · FastAPI Backend
 Run with: uvicorn main:app --reload
+Production: python main.py            (one worker per core)
+  (or: WEB_CONCURRENCY=4 uvicorn main:app --loop uvloop --http httptools)
+
+WEB_CONCURRENCY sets the number of worker processes (uvicorn reads it too).
+When it is set, each worker caps its threadpool at its share of the cores;
+inference always runs ONNX Runtime single-threaded on a dedicated thread.
 """
 
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import partial
+
+import anyio
 import joblib
-import numpy as np
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 from fastapi.middleware.cors import CORSMiddleware
 import roadmap  # noqa: F401  — EduPilot AI roadmap module (scaffold)
+from batcher import DynBatcher
+from inference import FastForest, OnnxForest
 
 # ─────────────────────────────────────────────
 # STARTUP: Load trained model
 # ─────────────────────────────────────────────
 
-MODEL_PATH = "model/model.pkl"
+MODEL_PATH      = "model/model.pkl"
+ONNX_MODEL_PATH = "model/model.onnx"   # written by train.py when skl2onnx is installed
 
-try:
-    model = joblib.load(MODEL_PATH)
-    print(f"✔ Model loaded successfully from '{MODEL_PATH}'")
-except FileNotFoundError:
-    raise RuntimeError(
-        f"Model file not found at '{MODEL_PATH}'. "
-        "Run train.py first to generate the model."
-    )
+def load_forest():
+    """
+    Load the mastery-level predictor: the ONNX export when onnxruntime is
+    available, otherwise the pickled forest compiled into a FastForest.
+    Called from the lifespan hook so only serving processes load the model.
+    """
+    if OnnxForest.available(ONNX_MODEL_PATH):
+        forest = OnnxForest(ONNX_MODEL_PATH)
+        print(f"✔ ONNX model loaded successfully from '{ONNX_MODEL_PATH}'")
+        return forest
+
+    try:
+        model = joblib.load(MODEL_PATH)
+        print(f"✔ Model loaded successfully from '{MODEL_PATH}'")
+    except FileNotFoundError:
+        raise RuntimeError(
+            f"Model file not found at '{MODEL_PATH}'. "
+            "Run train.py first to generate the model."
+        )
+
+    # Direct tree evaluation — bypasses sklearn's per-call validation overhead
+    return FastForest(model)
+
+# Concurrent /analyze requests are coalesced into a single forest.predict call
+batcher = DynBatcher(n_features=7, max_batch_size=64, max_delay=0.010)
+
+# Worker processes come from WEB_CONCURRENCY (exported by the entrypoint
+# below); a plain `uvicorn main:app` runs one process and keeps anyio's
+# default threadpool. Otherwise each worker gets its share of the cores.
+CPU_COUNT = os.cpu_count() or 1
+if "WEB_CONCURRENCY" in os.environ:
+    THREAD_LIMIT = max(CPU_COUNT // max(int(os.environ["WEB_CONCURRENCY"]), 1), 1)
+else:
+    THREAD_LIMIT = None
 
 # ─────────────────────────────────────────────
 # APP INITIALISATION
 # ─────────────────────────────────────────────
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the model and start the inference batcher; stop it on shutdown."""
+    if THREAD_LIMIT is not None:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREAD_LIMIT
+    await batcher.start(load_forest().predict)
+    yield
+    await batcher.stop()
+
+
 app = FastAPI(
     title="AI Skill Gap Analyser",
     description="Analyses student quiz performance and returns a personalised learning roadmap.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -45,8 +96,10 @@ app.add_middleware(
 
 
 # ─────────────────────────────────────────────
-# PYDANTIC REQUEST MODEL
+# PYDANTIC REQUEST / RESPONSE MODELS
 # ─────────────────────────────────────────────
+# Declared response models let FastAPI serialise straight to JSON bytes via
+# Pydantic's compiled serializer instead of jsonable_encoder + json.dumps.
 
 class QuizInput(BaseModel):
     """Incoming quiz accuracy scores and timing data from the student."""
@@ -68,6 +121,19 @@ class QuizInput(BaseModel):
         }
     }
 
+
+class AnalysisResult(BaseModel):
+    """Skill gap analysis returned by /analyze."""
+    mastery_level: str
+    weakest_topic: str
+    overall_score: float
+    roadmap:       str
+
+
+class HealthStatus(BaseModel):
+    """Liveness probe payload."""
+    status: str
+
 # ─────────────────────────────────────────────
 # HELPER: Label & Roadmap mappings
 # ─────────────────────────────────────────────
@@ -85,40 +151,66 @@ TOPIC_NAMES = {
     "os_accuracy":   "Operating Systems",
 }
 
+# Roadmap text per mastery level; {topic} is filled with the weakest topic
+ROADMAP_TEMPLATES = {
+    "Beginner": (
+        "Start with the fundamentals. Focus on core concepts in {topic} "
+        "before moving on. Use beginner-friendly resources like GeeksforGeeks, "
+        "Khan Academy, or introductory YouTube playlists. Aim to complete basic "
+        "exercises daily and revisit theory until it feels comfortable."
+    ),
+    "Developing": (
+        "You have a solid base — now sharpen it. Your weakest area is {topic}. "
+        "Work through intermediate problem sets on LeetCode or HackerRank. "
+        "Review topic-specific notes, attempt timed quizzes, and focus on "
+        "understanding 'why' solutions work, not just 'what' they are."
+    ),
+    "Proficient": (
+        "Great performance overall! To stay sharp, tackle advanced problems in "
+        "{topic} and explore system design or competitive programming. "
+        "Contribute to open source, mentor peers, or attempt mock interviews to "
+        "consolidate mastery and uncover any hidden gaps."
+    ),
+}
+
 def build_roadmap(mastery_level: str, weakest_topic: str) -> str:
     """
     Rule-based roadmap generator.
     Returns a concise, actionable study recommendation.
     """
-    roadmaps = {
-        "Beginner": (
-            f"Start with the fundamentals. Focus on core concepts in {weakest_topic} "
-            "before moving on. Use beginner-friendly resources like GeeksforGeeks, "
-            "Khan Academy, or introductory YouTube playlists. Aim to complete basic "
-            "exercises daily and revisit theory until it feels comfortable."
-        ),
-        "Developing": (
-            f"You have a solid base — now sharpen it. Your weakest area is {weakest_topic}. "
-            "Work through intermediate problem sets on LeetCode or HackerRank. "
-            "Review topic-specific notes, attempt timed quizzes, and focus on "
-            "understanding 'why' solutions work, not just 'what' they are."
-        ),
-        "Proficient": (
-            f"Great performance overall! To stay sharp, tackle advanced problems in "
-            f"{weakest_topic} and explore system design or competitive programming. "
-            "Contribute to open source, mentor peers, or attempt mock interviews to "
-            "consolidate mastery and uncover any hidden gaps."
-        ),
-    }
-    return roadmaps.get(mastery_level, "Keep practising consistently!")
+    template = ROADMAP_TEMPLATES.get(mastery_level, "Keep practising consistently!")
+    return template.format(topic=weakest_topic)
+
+
+# ─────────────────────────────────────────────
+# HELPER: /analyze response cache
+# ─────────────────────────────────────────────
+
+# LRU of quiz inputs → response; repeated submissions skip inference entirely.
+# Only touched from the event loop, so no locking is needed.
+ANALYZE_CACHE_SIZE = 4096
+_analyze_cache: OrderedDict = OrderedDict()
+
+def _cache_get(key: tuple):
+    """Return the cached response for `key` (marking it recently used), or None."""
+    response = _analyze_cache.get(key)
+    if response is not None:
+        _analyze_cache.move_to_end(key)
+    return response
+
+def _cache_put(key: tuple, response: dict) -> None:
+    """Store a response, evicting the least recently used entry when full."""
+    _analyze_cache[key] = response
+    if len(_analyze_cache) > ANALYZE_CACHE_SIZE:
+        _analyze_cache.popitem(last=False)
 
 
 # ─────────────────────────────────────────────
 # ENDPOINT 1: Health Check
 # ─────────────────────────────────────────────
 
-@app.get("/health", tags=["System"])
-def health_check():
+@app.get("/health", tags=["System"], response_model=HealthStatus)
+async def health_check():
     """Simple liveness probe — confirms the API is running."""
     return {"status": "running"}
 
@@ -127,8 +219,8 @@ def health_check():
 # ENDPOINT 2: Skill Gap Analysis
 # ─────────────────────────────────────────────
 
-@app.post("/analyze", tags=["Analysis"])
-def analyze(quiz: QuizInput):
+@app.post("/analyze", tags=["Analysis"], response_model=AnalysisResult)
+async def analyze(quiz: QuizInput):
     """
     Accepts student quiz scores, runs ML inference, and returns:
     - Mastery level (Beginner / Developing / Proficient)
@@ -137,6 +229,18 @@ def analyze(quiz: QuizInput):
     - Personalised study roadmap
     """
     try:
+        # ── 0. Serve repeated inputs from the cache ───
+        cache_key = (
+            quiz.ds_accuracy,
+            quiz.algo_accuracy,
+            quiz.dbms_accuracy,
+            quiz.os_accuracy,
+            quiz.avg_time,
+        )
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
         # ── 1. Derive computed features ───────────────
         topic_scores = {
             "ds_accuracy":   quiz.ds_accuracy,
@@ -152,10 +256,13 @@ def analyze(quiz: QuizInput):
             0.20 * quiz.os_accuracy,
             2
         )
-        weakest_topic_score = round(min(topic_scores.values()), 2)
+        # Single scan finds the weakest topic; its score is then a lookup
+        weakest_key         = min(topic_scores, key=topic_scores.get)
+        weakest_topic_score = round(topic_scores[weakest_key], 2)
 
         # ── 2. Build feature vector (must match training order) ──
-        features = np.array([[
+        #    Plain tuple — the batcher copies it into its preallocated matrix
+        features = (
             quiz.ds_accuracy,
             quiz.algo_accuracy,
             quiz.dbms_accuracy,
@@ -163,25 +270,26 @@ def analyze(quiz: QuizInput):
             quiz.avg_time,
             overall_score,
             weakest_topic_score,
-        ]])
+        )
 
-        # ── 3. Predict mastery label ───────────────────
-        prediction    = model.predict(features)[0]          # int: 0, 1, or 2
+        # ── 3. Predict mastery label (batched) ─────────
+        prediction    = await batcher.predict(features)     # int: 0, 1, or 2
         mastery_level = MASTERY_LABELS[int(prediction)]
 
         # ── 4. Identify weakest topic (human-readable) ─
-        weakest_key   = min(topic_scores, key=topic_scores.get)
         weakest_topic = TOPIC_NAMES[weakest_key]
 
         # ── 5. Generate roadmap ────────────────────────
         roadmap = build_roadmap(mastery_level, weakest_topic)
 
-        return {
+        response = {
             "mastery_level":  mastery_level,
             "weakest_topic":  weakest_topic,
             "overall_score":  overall_score,
             "roadmap":        roadmap,
         }
+        _cache_put(cache_key, response)
+        return dict(response)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
@@ -208,15 +316,54 @@ class RoadmapRequest(BaseModel):
     }
 
 
-@app.post("/generate-roadmap", tags=["Roadmap"])
-def generate_roadmap(req: RoadmapRequest):
+class StudyDay(BaseModel):
+    """One day of the generated study plan."""
+    day:   int
+    tasks: list[str]
+
+
+class RoadmapResponse(BaseModel):
+    """Day-wise study plan and guidance returned by /generate-roadmap."""
+    total_days:       int
+    total_topics:     int
+    study_plan:       list[StudyDay]
+    strategy_insight: str
+    burnout_risk:     str
+    mentor_advice:    str
+
+
+@app.post("/generate-roadmap", tags=["Roadmap"], response_model=RoadmapResponse)
+async def generate_roadmap(req: RoadmapRequest):
     """Generate a day-wise study plan from syllabus text and exam date."""
     try:
-        plan = roadmap.generate_study_plan(
+        plan = await anyio.to_thread.run_sync(partial(
+            roadmap.generate_study_plan,
             syllabus_text=req.syllabus_text,
             exam_date=req.exam_date,
             hours_per_day=req.hours_per_day,
-        )
+        ))
         return plan
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Roadmap generation failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Roadmap generation failed: {str(e)}")
+
+
+# ─────────────────────────────────────────────
+# ENTRYPOINT: multi-worker server
+# ─────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # One process per core gives true parallel inference (no shared GIL);
+    # exported so every worker sizes its threadpool to its share of the cores.
+    # "auto" picks uvloop / httptools when installed (uvicorn[standard]).
+    workers = max(int(os.environ.get("WEB_CONCURRENCY", CPU_COUNT)), 1)
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "main:app",
+        host=os.environ.get("HOST", "127.0.0.1"),
+        port=int(os.environ.get("PORT", "8000")),
+        workers=workers,
+        loop="auto",
+        http="auto",
+    )
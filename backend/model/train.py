@@ -3,6 +3,8 @@ train.py — AI Skill Gap Analyser
 Hackathon ML Pipeline: Synthetic Data → Feature Engineering → Model Training → Export
 """
 
+import os
+
 import numpy as np
 import pandas as pd
 import joblib
@@ -10,10 +12,19 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+except ImportError:                             # optional — ONNX export is skipped
+    convert_sklearn = None
+
 # ─────────────────────────────────────────────
 # STEP 1: Synthetic Dataset Generation
 # ─────────────────────────────────────────────
 
+# Weights for ds / algo / dbms / os accuracy in overall_score (mirrors main.py)
+TOPIC_WEIGHTS = np.array([0.30, 0.30, 0.20, 0.20])
+
 def generate_dataset(n_samples: int = 450, random_state: int = 42) -> pd.DataFrame:
     """
     Generate synthetic student quiz performance data.
@@ -21,33 +32,28 @@ def generate_dataset(n_samples: int = 450, random_state: int = 42) -> pd.DataFra
     """
     rng = np.random.default_rng(random_state)
 
-    # Simulate per-topic accuracy scores (0–100%)
-    ds_accuracy       = rng.uniform(10, 100, n_samples)   # Data Structures
-    algo_accuracy     = rng.uniform(10, 100, n_samples)   # Algorithms
-    dbms_accuracy     = rng.uniform(10, 100, n_samples)   # Database Management
-    os_accuracy       = rng.uniform(10, 100, n_samples)   # Operating Systems
+    # Simulate per-topic accuracy scores (0–100%) as one (n_samples, 4) matrix.
+    # Drawn as (4, n_samples) and transposed so the RNG stream — and therefore
+    # the dataset for a given seed — matches drawing each topic column in turn.
+    topics            = rng.uniform(10, 100, size=(4, n_samples)).T
 
     # avg_time: seconds taken per question (faster isn't always better — noise added)
     avg_time          = rng.uniform(15, 120, n_samples)
 
     # overall_score: weighted average of topic accuracies with slight noise
     overall_score = (
-        0.30 * ds_accuracy +
-        0.30 * algo_accuracy +
-        0.20 * dbms_accuracy +
-        0.20 * os_accuracy +
+        topics @ TOPIC_WEIGHTS +
         rng.normal(0, 3, n_samples)        # small real-world noise
     ).clip(0, 100)
 
     # weakest_topic_score: the lowest accuracy across the four topics for each student
-    topic_matrix      = np.stack([ds_accuracy, algo_accuracy, dbms_accuracy, os_accuracy], axis=1)
-    weakest_topic_score = topic_matrix.min(axis=1)
+    weakest_topic_score = topics.min(axis=1)
 
     df = pd.DataFrame({
-        "ds_accuracy":        ds_accuracy.round(2),
-        "algo_accuracy":      algo_accuracy.round(2),
-        "dbms_accuracy":      dbms_accuracy.round(2),
-        "os_accuracy":        os_accuracy.round(2),
+        "ds_accuracy":        topics[:, 0].round(2),     # Data Structures
+        "algo_accuracy":      topics[:, 1].round(2),     # Algorithms
+        "dbms_accuracy":      topics[:, 2].round(2),     # Database Management
+        "os_accuracy":        topics[:, 3].round(2),     # Operating Systems
         "avg_time":           avg_time.round(2),
         "overall_score":      overall_score.round(2),
         "weakest_topic_score": weakest_topic_score.round(2),
@@ -60,6 +66,9 @@ def generate_dataset(n_samples: int = 450, random_state: int = 42) -> pd.DataFra
 # STEP 2: Mastery Label Assignment
 # ─────────────────────────────────────────────
 
+# overall_score cut-offs between Beginner | Developing | Proficient
+MASTERY_BOUNDARIES = np.array([50.0, 75.0])
+
 def assign_mastery_label(df: pd.DataFrame) -> pd.DataFrame:
     """
     Assign mastery_label based on overall_score:
@@ -67,15 +76,10 @@ def assign_mastery_label(df: pd.DataFrame) -> pd.DataFrame:
       1 → Developing  (50 ≤ overall_score < 75)
       2 → Proficient  (overall_score ≥ 75)
     """
-    def label(score):
-        if score < 50:
-            return 0   # Beginner
-        elif score < 75:
-            return 1   # Developing
-        else:
-            return 2   # Proficient
-
-    df["mastery_label"] = df["overall_score"].apply(label)
+    # side="right" puts scores equal to a boundary in the upper class
+    df["mastery_label"] = np.searchsorted(
+        MASTERY_BOUNDARIES, df["overall_score"].to_numpy(), side="right"
+    )
     return df
 
 
@@ -110,7 +114,8 @@ def train_model(df: pd.DataFrame):
     # Random Forest: robust to feature scale, handles small datasets well
     model = RandomForestClassifier(
         n_estimators=100,
-        max_depth=None,         # let trees grow fully — dataset is small
+        max_depth=8,            # shallow trees — fewer nodes to walk per prediction
+        n_jobs=-1,              # fit trees in parallel across all cores
         random_state=42,
         class_weight="balanced" # handles any class imbalance gracefully
     )
@@ -139,9 +144,18 @@ def train_model(df: pd.DataFrame):
 # STEP 4: Save Outputs
 # ─────────────────────────────────────────────
 
-def save_outputs(df: pd.DataFrame, model, dataset_path: str = "dataset.csv", model_path: str = "model.pkl"):
+def save_outputs(
+    df: pd.DataFrame,
+    model,
+    dataset_path: str = "dataset.csv",
+    model_path: str = "model.pkl",
+    onnx_path: str = "model.onnx",
+):
     """
     Persist the dataset and trained model to disk.
+    If skl2onnx is installed, also export the model to ONNX for the
+    ONNX Runtime inference path in main.py; otherwise any existing ONNX
+    file is removed so it cannot outlive the pickle it was exported from.
     """
     df.to_csv(dataset_path, index=False)
     print(f"  ✔ Dataset saved  → {dataset_path}  ({len(df)} rows)")
@@ -149,6 +163,24 @@ def save_outputs(df: pd.DataFrame, model, dataset_path: str = "dataset.csv", mod
     joblib.dump(model, model_path)
     print(f"  ✔ Model saved    → {model_path}")
 
+    if convert_sklearn is None:
+        print("  ✘ skl2onnx not installed — skipping ONNX export")
+        # main.py prefers model.onnx when present; a leftover export from an
+        # earlier run would silently shadow the model just saved above
+        if os.path.exists(onnx_path):
+            os.remove(onnx_path)
+            print(f"  ✘ Removed stale  → {onnx_path}")
+        return
+
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[("X", FloatTensorType([None, model.n_features_in_]))],
+        options={id(model): {"zipmap": False}},   # plain label/probability tensors
+    )
+    with open(onnx_path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+    print(f"  ✔ ONNX saved     → {onnx_path}")
+
 
 # ─────────────────────────────────────────────
 # MAIN PIPELINE
@@ -8,6 +8,11 @@ personalised day-wise study plans.
 
 import math
 from datetime import datetime, date
+from functools import lru_cache
+
+
+# Unit numbering / punctuation trimmed from both ends of a topic
+_TOPIC_STRIP_CHARS = "-:;0123456789. "
 
 
 def parse_syllabus(syllabus_text: str) -> list:
@@ -16,19 +21,21 @@ def parse_syllabus(syllabus_text: str) -> list:
     comma-separated topics from each unit.
 
     Returns a flat list of trimmed, non-empty topic strings.
+    Parsing is cached per syllabus text; each call gets a fresh list.
     """
-    # Split on the word "Unit" (case-insensitive boundary)
-    units = syllabus_text.split("Unit")
+    return list(_parse_syllabus_cached(syllabus_text))
 
-    topics = []
-    for unit in units:
-        # Each unit block may contain comma-separated topics
-        for topic in unit.split(","):
-            cleaned = topic.strip().strip("-:;0123456789. ")
-            if cleaned:
-                topics.append(cleaned)
 
-    return topics
+@lru_cache(maxsize=256)
+def _parse_syllabus_cached(syllabus_text: str) -> tuple[str, ...]:
+    """Cached worker for parse_syllabus — returns an immutable tuple."""
+    # "Unit" boundaries and commas are both topic delimiters, so fold them
+    # into one and split once instead of splitting units, then each unit
+    topics = (
+        token.strip().strip(_TOPIC_STRIP_CHARS)
+        for token in syllabus_text.replace("Unit", ",").split(",")
+    )
+    return tuple(topic for topic in topics if topic)
 
 
 def calculate_days_until_exam(exam_date: str) -> int:
@@ -48,6 +55,7 @@ def calculate_days_until_exam(exam_date: str) -> int:
 
 # Keywords that signal a harder / more time-intensive topic
 HARD_KEYWORDS = ["Deadlock", "Normalization", "Scheduling", "Concurrency"]
+_HARD_KEYWORDS_LOWER = tuple(kw.lower() for kw in HARD_KEYWORDS)
 
 
 def _topic_weight(topic: str) -> int:
@@ -58,11 +66,10 @@ def _topic_weight(topic: str) -> int:
       • +1 if the topic has more than 2 words (indicates breadth)
     """
     weight = 1
-    for kw in HARD_KEYWORDS:
-        if kw.lower() in topic.lower():
-            weight += 1
-            break                       # count keyword bonus only once
-    if len(topic.split()) > 2:
+    lowered = topic.lower()
+    if any(kw in lowered for kw in _HARD_KEYWORDS_LOWER):
+        weight += 1                     # count keyword bonus only once
+    if len(topic.split(maxsplit=2)) > 2:    # stop splitting once a third word is seen
         weight += 1
     return weight
 
@@ -110,51 +117,63 @@ def generate_strategy_insight(total_days: int, total_topics: int, hours_per_day:
     return " ".join(parts)
 
 
-def assess_burnout_risk(total_days: int, total_topics: int, study_plan: list[dict]) -> str:
+def assess_burnout_risk(
+    total_days: int,
+    total_topics: int,
+    has_revision: bool,
+    max_tasks_per_day: int,
+) -> str:
     """
     Evaluate burnout risk based on schedule density.
 
+    `has_revision` and `max_tasks_per_day` are tracked by
+    generate_study_plan while it builds the plan, so no rescan is needed.
+
     Returns "Low", "Medium", or "High".
     """
     effective_days = max(total_days - 2, 1)
     topics_per_day = total_topics / effective_days
 
-    heavy_day = any(len(day["tasks"]) > 3 for day in study_plan)
-
-    revision_exists = any(
-        any("Revision" in t or "Mock" in t for t in day["tasks"])
-        for day in study_plan
-    )
-
-    if topics_per_day > 3 or heavy_day:
+    if topics_per_day > 3 or max_tasks_per_day > 3:
         return "High"
-    if not revision_exists:
+    if not has_revision:
         return "Medium"
     if 2 <= topics_per_day <= 3:
         return "Medium"
     return "Low"
 
 
+# Mentor advice per burnout risk level
+MENTOR_ADVICE = {
+    "High": (
+        "Your schedule is highly compressed and may lead to fatigue. "
+        "Consider increasing daily study hours or extending your timeline "
+        "to maintain retention and avoid burnout."
+    ),
+    "Medium": (
+        "Your plan is achievable but moderately intensive. Stay consistent, "
+        "protect revision time, and monitor your energy levels."
+    ),
+    "Low": (
+        "Your plan is well balanced with healthy spacing and revision blocks. "
+        "Maintain consistency and focus on reinforcing weak topics."
+    ),
+}
+
+
 def generate_mentor_advice(burnout_risk: str) -> str:
     """
     Return dynamic mentor advice based on the burnout risk level.
     """
-    advice = {
-        "High": (
-            "Your schedule is highly compressed and may lead to fatigue. "
-            "Consider increasing daily study hours or extending your timeline "
-            "to maintain retention and avoid burnout."
-        ),
-        "Medium": (
-            "Your plan is achievable but moderately intensive. Stay consistent, "
-            "protect revision time, and monitor your energy levels."
-        ),
-        "Low": (
-            "Your plan is well balanced with healthy spacing and revision blocks. "
-            "Maintain consistency and focus on reinforcing weak topics."
-        ),
-    }
-    return advice.get(burnout_risk, advice["Medium"])
+    return MENTOR_ADVICE.get(burnout_risk, MENTOR_ADVICE["Medium"])
+
+
+# Tasks rotated through study days left over after all topics are covered
+FILLER_TASKS = (
+    "Practice Problems",
+    "Reinforce Weak Topics",
+    "Timed Quiz Session",
+)
 
 
 def generate_study_plan(
@@ -177,28 +196,33 @@ def generate_study_plan(
     total_days = calculate_days_until_exam(exam_date)
     total_topics = len(topics)
 
-    study_plan: list[dict] = []
+    # Preallocated to its final length below; every slot is filled before return
+    study_plan: list[dict | None]
 
     # ── Step 2: short-exam fast path (≤ 3 days) ───────
     if total_days <= 3:
         study_days = max(total_days - 1, 1)
         topics_per_day = math.ceil(total_topics / study_days) if total_topics else 1
 
-        day_number = 1
-        for i in range(0, total_topics, topics_per_day):
-            study_plan.append({
-                "day": day_number,
+        # Plan length is known up front: one entry per topic chunk + revision day
+        topic_starts = range(0, total_topics, topics_per_day)
+        study_plan = [None] * (len(topic_starts) + 1)
+
+        for idx, i in enumerate(topic_starts):
+            study_plan[idx] = {
+                "day": idx + 1,
                 "tasks": topics[i : i + topics_per_day],
-            })
-            day_number += 1
+            }
 
         # Last day → revision
-        study_plan.append({
+        study_plan[-1] = {
             "day": total_days,
             "tasks": ["Full Revision"],
-        })
+        }
 
-        burnout = assess_burnout_risk(total_days, total_topics, study_plan)
+        # First topic chunk is the fullest; the revision day has one task
+        max_tasks_per_day = max(min(topics_per_day, total_topics), 1)
+        burnout = assess_burnout_risk(total_days, total_topics, True, max_tasks_per_day)
         return {
             "total_days": total_days,
             "total_topics": total_topics,
@@ -223,40 +247,39 @@ def generate_study_plan(
     # ── Step 5: topics per active day ──────────────────
     topics_per_day = math.ceil(total_topics / active_topic_days) if active_topic_days else 1
 
+    # Plan length is known up front: topic chunks + practice days + 2 revision days
+    topic_starts  = range(0, total_topics, topics_per_day)
+    leftover_days = study_days - active_topic_days
+    study_plan = [None] * (len(topic_starts) + leftover_days + 2)
+
     # ── Step 6: assign topics day by day ───────────────
-    day_number = 1
-    for i in range(0, total_topics, topics_per_day):
-        study_plan.append({
-            "day": day_number,
+    for idx, i in enumerate(topic_starts):
+        study_plan[idx] = {
+            "day": idx + 1,
             "tasks": topics[i : i + topics_per_day],
-        })
-        day_number += 1
+        }
 
     # ── Step 7: fill leftover days with practice ───────
-    filler_tasks = [
-        "Practice Problems",
-        "Reinforce Weak Topics",
-        "Timed Quiz Session",
-    ]
-    leftover_days = study_days - active_topic_days
     for j in range(leftover_days):
-        study_plan.append({
-            "day": day_number,
-            "tasks": [filler_tasks[j % len(filler_tasks)]],
-        })
-        day_number += 1
+        idx = len(topic_starts) + j
+        study_plan[idx] = {
+            "day": idx + 1,
+            "tasks": [FILLER_TASKS[j % len(FILLER_TASKS)]],
+        }
 
     # ── Step 8: revision tail (last 2 days) ────────────
-    study_plan.append({
+    study_plan[-2] = {
         "day": total_days - 1,
         "tasks": ["Weak Topic Revision"],
-    })
-    study_plan.append({
+    }
+    study_plan[-1] = {
         "day": total_days,
         "tasks": ["Full Revision", "Mock Test"],
-    })
+    }
 
-    burnout = assess_burnout_risk(total_days, total_topics, study_plan)
+    # First topic chunk is the fullest; practice days have one task, revision days ≤ 2
+    max_tasks_per_day = max(min(topics_per_day, total_topics), 2)
+    burnout = assess_burnout_risk(total_days, total_topics, True, max_tasks_per_day)
     return {
         "total_days": total_days,
         "total_topics": total_topics,